@@ -1,6 +1,19 @@
+import asyncio
+import contextlib
+import datetime
+import gzip
+import hashlib
 import json
 import logging
+import math
+import mimetypes
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import (
     Cookie,
@@ -11,16 +24,29 @@ from fastapi import (
     Security,
     status,
 )
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from starlette.datastructures import URL
+from google.api_core import exceptions as google_exceptions
+from starlette.datastructures import URL, Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # from firebase_admin import auth, credentials, firestore, initialize_app
 from firebase_admin import auth, firestore, initialize_app
+from markupsafe import Markup
 from pydantic import BaseModel
 
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are built without it
+    brotli = None
+
 # Only set these when NOT running on Cloud Run
 if not os.getenv("K_SERVICE"):
     os.environ["FIRESTORE_EMULATOR_HOST"] = "localhost:8081"
@@ -37,6 +63,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # 1. Initialize Firebase Admin
 # If FIREBASE_AUTH_EMULATOR_HOST is in env, it connects to local emulator automatically
 if not len(initialize_app().name):
@@ -47,15 +80,456 @@ else:
 
 db = firestore.client()
 
-app = FastAPI(title="Multi-Tenant CRUD API", root_path="/app")
+
+class LatencyStats:
+    """Rolling latency window for the debug endpoints."""
+
+    def __init__(self, window: int = 1024):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def record(self, duration: float, failed: bool = False) -> None:
+        with self.lock:
+            self.samples.append(duration)
+            self.count += 1
+            self.failures += failed
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            samples = sorted(self.samples)
+            count, failures = self.count, self.failures
+        if not samples:
+            return {"count": count, "failures": failures}
+
+        def percentile(p: float) -> float:
+            index = min(len(samples) - 1, int(len(samples) * p))
+            return round(samples[index] * 1000, 2)
+
+        return {
+            "count": count,
+            "failures": failures,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+# 2. Token Verification
+# RSA verification runs in a bounded thread pool so it never blocks the event
+# loop, and Google's signing certificates are refreshed in the background before
+# their Cache-Control max-age runs out, so no request pays for the refetch.
+# Calls that go to the Auth backend (revocation checks, minting and revoking
+# sessions, certificate refreshes) use their own pool, so a slow backend never
+# queues local verifications behind it.
+AUTH_VERIFY_WORKERS = int(os.getenv("AUTH_VERIFY_WORKERS", "4"))
+AUTH_BACKEND_WORKERS = int(os.getenv("AUTH_BACKEND_WORKERS", "16"))
+AUTH_CERT_REFRESH_MARGIN = float(os.getenv("AUTH_CERT_REFRESH_MARGIN", "300"))
+AUTH_CERT_RETRY_INTERVAL = 60.0
+
+auth_executor = ThreadPoolExecutor(
+    max_workers=AUTH_VERIFY_WORKERS, thread_name_prefix="auth-verify"
+)
+auth_backend_executor = ThreadPoolExecutor(
+    max_workers=AUTH_BACKEND_WORKERS, thread_name_prefix="auth-backend"
+)
+auth_verify_stats = LatencyStats()
+auth_cert_refresh_stats = LatencyStats()
+auth_cert_status: dict = {"expires_in": None, "last_refresh": None}
+
+
+async def run_auth_call(func, *args, **kwargs):
+    """Runs a blocking firebase_admin.auth call in the auth thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(auth_executor, lambda: func(*args, **kwargs))
+
+
+async def run_auth_backend_call(func, *args, **kwargs):
+    """Runs a firebase_admin.auth call that makes a network request."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        auth_backend_executor, lambda: func(*args, **kwargs)
+    )
+
+
+async def verify_id_token(id_token: str) -> dict:
+    started = time.perf_counter()
+    try:
+        decoded_token = await run_auth_call(auth.verify_id_token, id_token)
+    except Exception:
+        auth_verify_stats.record(time.perf_counter() - started, failed=True)
+        raise
+    auth_verify_stats.record(time.perf_counter() - started)
+    return decoded_token
+
+
+# Session cookies are minted by /auth/session and verified locally against
+# cached keys. Verified claims are kept in-process. Revocation is checked
+# against the Auth backend when a cookie is first seen by this instance and
+# then at most every SESSION_REVOCATION_CHECK_INTERVAL. If the backend cannot be
+# reached, cached sessions are kept until they expire and the check is retried
+# after SESSION_REVOCATION_RETRY_INTERVAL.
+SESSION_COOKIE_MIN_AGE = 5 * 60
+SESSION_COOKIE_MAX_AGE = 14 * 24 * 60 * 60
+SESSION_COOKIE_LIFETIME = min(
+    SESSION_COOKIE_MAX_AGE,
+    max(
+        SESSION_COOKIE_MIN_AGE,
+        int(os.getenv("SESSION_COOKIE_LIFETIME", str(SESSION_COOKIE_MAX_AGE))),
+    ),
+)
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "3600"))
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_REVOCATION_CHECK_INTERVAL = float(
+    os.getenv("SESSION_REVOCATION_CHECK_INTERVAL", "300")
+)
+SESSION_REVOCATION_RETRY_INTERVAL = 30.0
+# Sessions are only minted for ID tokens from a sign-in this recent (seconds)
+SESSION_MAX_AUTH_AGE = 5 * 60
+# Errors that mean the cookie must be rejected, as opposed to a backend outage
+SESSION_REJECTED_ERRORS = (
+    auth.RevokedSessionCookieError,
+    auth.ExpiredSessionCookieError,
+    auth.InvalidSessionCookieError,
+    auth.UserDisabledError,
+    auth.UserNotFoundError,
+    ValueError,
+)
+
+session_verify_stats = LatencyStats()
+session_cache_stats: Counter[str] = Counter()
+# sha256(cookie) -> (claims, cached until, last revocation check)
+session_cache: OrderedDict[str, tuple[dict, float, float]] = OrderedDict()
+
+
+def _session_cache_key(session_cookie: str) -> str:
+    return hashlib.sha256(session_cookie.encode()).hexdigest()
+
+
+def evict_session(session_cookie: str) -> None:
+    session_cache.pop(_session_cache_key(session_cookie), None)
+
+
+def _cache_session(key: str, claims: dict, revocation_checked_at: float) -> None:
+    expires_at = min(claims["exp"], time.time() + SESSION_CACHE_TTL)
+    session_cache[key] = (claims, expires_at, revocation_checked_at)
+    session_cache.move_to_end(key)
+    while len(session_cache) > SESSION_CACHE_SIZE:
+        session_cache.popitem(last=False)
+
+
+async def create_session_cookie(id_token: str) -> str:
+    """
+    Mints a session cookie and caches its claims, so the first request made
+    with it does not need a revocation round trip.
+    """
+    session_cookie = await run_auth_backend_call(
+        auth.create_session_cookie,
+        id_token,
+        expires_in=datetime.timedelta(seconds=SESSION_COOKIE_LIFETIME),
+    )
+    # Signature check only: the cookie was minted from a token verified just now
+    claims = await run_auth_call(auth.verify_session_cookie, session_cookie)
+    _cache_session(_session_cache_key(session_cookie), claims, time.time())
+    return session_cookie
+
+
+async def verify_session_cookie(session_cookie: str) -> dict:
+    key = _session_cache_key(session_cookie)
+    now = time.time()
+
+    cached = session_cache.get(key)
+    if cached and cached[1] > now:
+        claims, _, revocation_checked_at = cached
+        if now - revocation_checked_at < SESSION_REVOCATION_CHECK_INTERVAL:
+            session_cache_stats["hits"] += 1
+            session_cache.move_to_end(key)
+            return claims
+        session_cache_stats["revocation_checks"] += 1
+    else:
+        # Unknown to this instance (new instance, eviction or expiry), so the
+        # cookie may have been revoked at any point in its lifetime.
+        session_cache_stats["misses"] += 1
+
+    started = time.perf_counter()
+    try:
+        claims = await run_auth_backend_call(
+            auth.verify_session_cookie, session_cookie, check_revoked=True
+        )
+    except SESSION_REJECTED_ERRORS:
+        session_verify_stats.record(time.perf_counter() - started, failed=True)
+        session_cache.pop(key, None)
+        raise
+    except Exception:
+        session_verify_stats.record(time.perf_counter() - started, failed=True)
+        if not cached or cached[0]["exp"] <= now:
+            raise
+        # The backend could not answer, which says nothing about the cookie
+        session_cache_stats["revocation_check_errors"] += 1
+        logger.warning(
+            "Session revocation check failed; retrying in %.0fs",
+            SESSION_REVOCATION_RETRY_INTERVAL,
+            exc_info=True,
+        )
+        claims = cached[0]
+        retry_at = now + SESSION_REVOCATION_RETRY_INTERVAL
+        _cache_session(key, claims, retry_at - SESSION_REVOCATION_CHECK_INTERVAL)
+        return claims
+    session_verify_stats.record(time.perf_counter() - started)
+
+    _cache_session(key, claims, now)
+    return claims
+
+
+def _cert_fetcher():
+    """
+    Returns the cached HTTP request and certificate URLs firebase_admin verifies
+    ID tokens and session cookies with, so refreshing through it warms the cache
+    verification reads. Returns None if the SDK internals are not shaped as
+    expected.
+    """
+    try:
+        token_verifier = auth._get_client(None)._token_verifier
+        cert_urls = [
+            token_verifier.id_token_verifier.cert_url,
+            token_verifier.cookie_verifier.cert_url,
+        ]
+        return token_verifier.request, cert_urls
+    except AttributeError:
+        return None
+
+
+def _max_age(cache_control: str) -> float | None:
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            return float(value)
+    return None
+
+
+def refresh_auth_certs(request, cert_urls: list[str]) -> float | None:
+    """Fetches every certificate URL and returns the shortest max-age."""
+    max_ages = []
+    for cert_url in cert_urls:
+        # no-cache forces a network fetch; the response replaces the cached copy
+        response = request(
+            url=cert_url, method="GET", headers={"Cache-Control": "no-cache"}
+        )
+        if response.status != 200:
+            raise RuntimeError(f"Certificate fetch returned HTTP {response.status}")
+        max_age = _max_age(response.headers.get("cache-control", ""))
+        if max_age is not None:
+            max_ages.append(max_age)
+    return min(max_ages, default=None)
+
+
+async def keep_auth_certs_fresh():
+    if os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        logger.info("Auth emulator in use; skipping certificate prefetch")
+        return
+    fetcher = _cert_fetcher()
+    if fetcher is None:
+        logger.warning("Unable to locate firebase_admin certificate cache")
+        return
+
+    while True:
+        started = time.perf_counter()
+        try:
+            max_age = await run_auth_backend_call(refresh_auth_certs, *fetcher)
+            auth_cert_refresh_stats.record(time.perf_counter() - started)
+            auth_cert_status["expires_in"] = max_age
+            auth_cert_status["last_refresh"] = time.time()
+            delay = (
+                max(AUTH_CERT_RETRY_INTERVAL, max_age - AUTH_CERT_REFRESH_MARGIN)
+                if max_age
+                else AUTH_CERT_RETRY_INTERVAL
+            )
+            logger.info("Refreshed auth certificates; next refresh in %.0fs", delay)
+        except Exception:
+            auth_cert_refresh_stats.record(time.perf_counter() - started, failed=True)
+            logger.exception("Auth certificate refresh failed")
+            delay = AUTH_CERT_RETRY_INTERVAL
+        await asyncio.sleep(delay)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    cert_refresher = asyncio.create_task(keep_auth_certs_fresh())
+    if FORM_WRITE_BEHIND:
+        write_behind.start()
+    yield
+    await write_behind.drain()
+    cert_refresher.cancel()
+    auth_executor.shutdown(wait=False)
+    auth_backend_executor.shutdown(wait=False)
+
+
+app = FastAPI(title="Multi-Tenant CRUD API", root_path="/app", lifespan=lifespan)
+
+
+# Static asset pipeline
+# Files under static/ are copied into a per-build directory under
+# STATIC_BUILD_DIR at startup with a content hash in their name
+# (css/style.css -> css/style.<hash>.css) plus .gz/.br variants. A build is
+# never rewritten once in place. Hashed files never change, so they are served
+# as immutable and Firebase Hosting's CDN can answer repeat requests without
+# reaching Cloud Run.
+STATIC_DIR = "static"
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR", "static_build")
+STATIC_COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".json", ".svg", ".txt", ".html"}
+STATIC_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_DEFAULT_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def _write_asset(dest: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, "wb") as f:
+        f.write(data)
+    if os.path.splitext(dest)[1] in STATIC_COMPRESSIBLE_EXTENSIONS:
+        with open(f"{dest}.gz", "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(f"{dest}.br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+
+
+def build_static_assets(source_dir: str, build_dir: str) -> tuple[str, dict[str, str]]:
+    """
+    Fingerprints and precompresses every file in source_dir into a subdirectory
+    of build_dir named after the hash of all sources. Returns that directory and
+    a manifest mapping original relative paths to hashed ones.
+    """
+    sources = []
+    build_hash = hashlib.sha256(b"br" if brotli is not None else b"")
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            src = os.path.join(root, filename)
+            rel_path = os.path.relpath(src, source_dir).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            build_hash.update(f"{rel_path}\0{digest}\0".encode())
+            stem, ext = os.path.splitext(rel_path)
+            sources.append((rel_path, f"{stem}.{digest[:12]}{ext}", data))
+    manifest = {rel_path: hashed_path for rel_path, hashed_path, _ in sources}
+
+    output_dir = os.path.join(build_dir, build_hash.hexdigest()[:12])
+    if os.path.isdir(output_dir):
+        return output_dir, manifest
+
+    # Workers started together (uvicorn --workers, gunicorn) each build into a
+    # private directory and rename it into place, so files being served by
+    # another worker are never deleted or partially written
+    os.makedirs(build_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".build-", dir=build_dir)
+    os.chmod(tmp_dir, 0o755)
+    for rel_path, hashed_path, data in sources:
+        # Keep the original name too so stale references still resolve
+        _write_asset(os.path.join(tmp_dir, rel_path), data)
+        _write_asset(os.path.join(tmp_dir, hashed_path), data)
+    try:
+        os.rename(tmp_dir, output_dir)
+    except OSError:
+        # Another worker finished the same build first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    logger.info("Built %s static assets into %s", len(manifest), output_dir)
+    return output_dir, manifest
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Parses an Accept-Encoding header into {coding: q-value}."""
+    codings = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that prefers .br/.gz variants when the client accepts them and
+    marks fingerprinted files as immutable.
+    """
+
+    def __init__(self, *, immutable_paths: set[str], **kwargs):
+        super().__init__(**kwargs)
+        self.immutable_paths = immutable_paths
+
+    async def get_response(self, path: str, scope):
+        codings = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        wildcard = codings.get("*", 0.0)
+        # Highest q-value first, brotli before gzip on ties; q=0 means "not this"
+        candidates = sorted(
+            (
+                (codings.get(encoding, wildcard), encoding, suffix)
+                for encoding, suffix in (("br", ".br"), ("gzip", ".gz"))
+            ),
+            key=lambda candidate: -candidate[0],
+        )
+        response = None
+        for q, encoding, suffix in candidates:
+            if q <= 0:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except StarletteHTTPException:
+                continue
+            if response.status_code in (200, 304):
+                response.headers["content-encoding"] = encoding
+                media_type = mimetypes.guess_type(path)[0]
+                if media_type:
+                    # Match the charset Starlette adds for uncompressed text
+                    if media_type.startswith("text/"):
+                        media_type += f"; charset={response.charset}"
+                    response.headers["content-type"] = media_type
+                break
+            response = None
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["vary"] = "Accept-Encoding"
+        if path.replace(os.sep, "/") in self.immutable_paths:
+            response.headers["cache-control"] = STATIC_IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = STATIC_DEFAULT_CACHE_CONTROL
+        return response
+
+
+static_build_dir, static_manifest = build_static_assets(STATIC_DIR, STATIC_BUILD_DIR)
+
+
+def static_url(path: str) -> str:
+    """Returns the fingerprinted URL for a file under static/."""
+    return f"{app.root_path}/static/{static_manifest.get(path, path)}"
 
 
 # Mount Static and Templates
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(
+        directory=static_build_dir,
+        immutable_paths=set(static_manifest.values()),
+    ),
+    name="static",
+)
 
 templates = Jinja2Templates(directory="templates")
 templates.env.globals["project_id"] = os.getenv("GOOGLE_CLOUD_PROJECT", "")
 templates.env.globals["root_path"] = "/app"
+templates.env.globals["static_url"] = static_url
 
 firebase_config_raw = os.getenv("FIREBASE_CONFIG_JSON")
 
@@ -73,12 +547,19 @@ class SessionRequest(BaseModel):
     token: str
 
 
-# 2. Security Schemes
+# 3. Security Schemes
 api_key_header = APIKeyHeader(name="X-API-KEY", auto_error=False)
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-# 3. Identity Resolver Dependency
+# 4. Identity Resolver Dependency
+# API key -> uid lookups are cached briefly so a busy key is resolved (and can
+# be rate limited) without a Firestore read on every request.
+API_KEY_CACHE_TTL = float(os.getenv("API_KEY_CACHE_TTL", "60"))
+API_KEY_CACHE_SIZE = int(os.getenv("API_KEY_CACHE_SIZE", "10000"))
+api_key_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+
 async def get_tenant_id(
     api_key: str = Security(api_key_header),
     token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
@@ -86,17 +567,25 @@ async def get_tenant_id(
 ) -> str:
     # Path A: Check API Key (Automation)
     if api_key:
+        cached = api_key_cache.get(api_key)
+        if cached and cached[0] > time.monotonic():
+            api_key_cache.move_to_end(api_key)
+            return cached[1]
         key_doc = db.collection("api_keys").document(api_key).get()
         if key_doc.exists:
             uid = key_doc.to_dict().get("uid")
             if not uid:
                 raise HTTPException(status_code=401, detail="Invalid API key")
+            api_key_cache[api_key] = (time.monotonic() + API_KEY_CACHE_TTL, uid)
+            api_key_cache.move_to_end(api_key)
+            while len(api_key_cache) > API_KEY_CACHE_SIZE:
+                api_key_cache.popitem(last=False)
             return uid
 
     # Path B: Check Bearer Token (Frontend User)
     if token:
         try:
-            decoded_token = auth.verify_id_token(token.credentials)
+            decoded_token = await verify_id_token(token.credentials)
             return decoded_token["uid"]
         except Exception as e:
             logger.warning(f"Bearer token verification failed: {e}")
@@ -104,8 +593,8 @@ async def get_tenant_id(
     # Path C: Check Cookie (HTML Frontend)
     if session:
         try:
-            # Verify the Firebase ID token stored in the cookie
-            decoded_token = auth.verify_id_token(session)
+            # Verify the Firebase session cookie
+            decoded_token = await verify_session_cookie(session)
             logger.info(f"Session cookie verified for uid: {decoded_token['uid']}")
             return decoded_token["uid"]
         except Exception as e:
@@ -127,17 +616,487 @@ async def get_tenant_id_or_redirect(
         raise
 
 
-# 4. CRUD Routes
+# Admission Control
+# Per-tenant token buckets and concurrency limits, plus a global in-flight cap,
+# reject excess requests with 429/503 and Retry-After before any Firestore work.
+# A limit of 0 disables that check.
+ADMISSION_TENANT_RATE = float(os.getenv("ADMISSION_TENANT_RATE", "20"))
+ADMISSION_TENANT_BURST = float(os.getenv("ADMISSION_TENANT_BURST", "40"))
+ADMISSION_TENANT_CONCURRENCY = int(os.getenv("ADMISSION_TENANT_CONCURRENCY", "8"))
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "80"))
+ADMISSION_EXEMPT_PATHS = ("/health", "/static/")
+# Token buckets are swept of fully refilled tenants once this many are tracked
+ADMISSION_BUCKET_PRUNE_THRESHOLD = int(
+    os.getenv("ADMISSION_BUCKET_PRUNE_THRESHOLD", "10000")
+)
+# Per-tenant rejection counts kept for /debug-admission (least recent dropped)
+ADMISSION_TRACKED_TENANTS = 1000
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        tenant_rate: float,
+        tenant_burst: float,
+        tenant_concurrency: int,
+        max_in_flight: int,
+    ):
+        self.tenant_rate = tenant_rate
+        self.tenant_burst = tenant_burst
+        self.tenant_concurrency = tenant_concurrency
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.tenant_in_flight: defaultdict[str, int] = defaultdict(int)
+        # uid -> [tokens, last refill time]
+        self.buckets: dict[str, list[float]] = {}
+        self.rejections: Counter[str] = Counter()
+        self.tenant_rejections: OrderedDict[str, int] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def try_enter(self) -> bool:
+        with self.lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                self.rejections["global_in_flight"] += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def exit(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    def try_admit_tenant(self, uid: str) -> float | None:
+        """
+        Reserves a token and a concurrency slot for uid.
+        Returns None when admitted, otherwise the seconds to wait before retrying.
+        """
+        with self.lock:
+            in_flight = self.tenant_in_flight.get(uid, 0)
+            if self.tenant_concurrency and in_flight >= self.tenant_concurrency:
+                self._reject_tenant(uid, "tenant_concurrency")
+                return 1.0
+
+            if self.tenant_rate:
+                now = time.monotonic()
+                buckets_full = len(self.buckets) >= ADMISSION_BUCKET_PRUNE_THRESHOLD
+                if buckets_full and uid not in self.buckets:
+                    self._prune_buckets(now)
+                bucket = self.buckets.setdefault(uid, [self.tenant_burst, now])
+                bucket[0] = min(
+                    self.tenant_burst, bucket[0] + (now - bucket[1]) * self.tenant_rate
+                )
+                bucket[1] = now
+                if bucket[0] < 1:
+                    self._reject_tenant(uid, "tenant_rate")
+                    return (1 - bucket[0]) / self.tenant_rate
+                bucket[0] -= 1
+
+            self.tenant_in_flight[uid] += 1
+            return None
+
+    def _reject_tenant(self, uid: str, reason: str) -> None:
+        self.rejections[reason] += 1
+        self.tenant_rejections[uid] = self.tenant_rejections.pop(uid, 0) + 1
+        while len(self.tenant_rejections) > ADMISSION_TRACKED_TENANTS:
+            self.tenant_rejections.popitem(last=False)
+
+    def _prune_buckets(self, now: float) -> None:
+        # Buckets that would have refilled completely carry no state worth keeping
+        refill_time = self.tenant_burst / self.tenant_rate
+        for uid, (_, updated) in list(self.buckets.items()):
+            if now - updated >= refill_time:
+                del self.buckets[uid]
+
+    def release_tenant(self, uid: str) -> None:
+        with self.lock:
+            self.tenant_in_flight[uid] -= 1
+            if self.tenant_in_flight[uid] <= 0:
+                del self.tenant_in_flight[uid]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "in_flight": self.in_flight,
+                "tenants_in_flight": len(self.tenant_in_flight),
+                "rejections": dict(self.rejections),
+                "top_rejected_tenants": dict(
+                    Counter(self.tenant_rejections).most_common(10)
+                ),
+            }
+
+
+admission = AdmissionController(
+    tenant_rate=ADMISSION_TENANT_RATE,
+    tenant_burst=ADMISSION_TENANT_BURST,
+    tenant_concurrency=ADMISSION_TENANT_CONCURRENCY,
+    max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+)
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware enforcing the global in-flight cap.
+
+    Admission slots are released when the final body message has been sent,
+    not when the response object is returned, so streamed responses keep their
+    slot until the last row is written. Tenant slots taken during the request
+    are added to the same release list.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].removeprefix(scope.get("root_path", ""))
+        if path.startswith(ADMISSION_EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if not admission.try_enter():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, retry shortly"},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        releases = [admission.exit]
+        scope["admission.releases"] = releases
+
+        def release_all():
+            while releases:
+                releases.pop()()
+
+        async def send_and_release(message):
+            try:
+                await send(message)
+            finally:
+                if message["type"] == "http.response.body" and not message.get(
+                    "more_body", False
+                ):
+                    release_all()
+
+        try:
+            await self.app(scope, receive, send_and_release)
+        finally:
+            # Covers errors and client disconnects before the final body
+            release_all()
+
+
+app.add_middleware(AdmissionMiddleware)
+
+
+def admit_tenant(request: Request, uid: str) -> None:
+    """
+    Takes a token and a concurrency slot for uid, held until the response body
+    has been sent. Raises 429 with Retry-After when the tenant is over its limits.
+    """
+    retry_after = admission.try_admit_tenant(uid)
+    if retry_after is not None:
+        logger.debug("Rejected request for uid %s, retry after %.2fs", uid, retry_after)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+    request.scope["admission.releases"].append(lambda: admission.release_tenant(uid))
+
+
+async def get_admitted_tenant_id(
+    request: Request, uid: str = Depends(get_tenant_id)
+) -> str:
+    """Resolves the tenant and holds an admission slot for the request."""
+    admit_tenant(request, uid)
+    return uid
+
+
+# Write-Behind Queue
+# With FORM_WRITE_BEHIND the HTML form routes acknowledge a mutation once it is
+# queued, and a background task commits queued writes in grouped WriteBatch
+# commits of up to WRITE_BEHIND_BATCH_SIZE writes every WRITE_BEHIND_WINDOW
+# seconds. Queued writes are overlaid on the same instance's next dashboard
+# render, and the queue is drained on shutdown (Cloud Run sends SIGTERM and
+# allows 10 seconds). When the queue is full, routes wait for space rather than
+# committing synchronously, which could be overwritten by older queued writes.
+# Writes that fail transiently are retried with backoff at the head of the
+# queue, so later writes to the same item never overtake them.
+FORM_WRITE_BEHIND = env_flag("FORM_WRITE_BEHIND")
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "1000"))
+WRITE_BEHIND_BATCH_SIZE = min(500, int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200")))
+WRITE_BEHIND_WINDOW = float(os.getenv("WRITE_BEHIND_WINDOW", "0.05"))
+WRITE_BEHIND_DRAIN_TIMEOUT = float(os.getenv("WRITE_BEHIND_DRAIN_TIMEOUT", "8"))
+WRITE_BEHIND_RETRY_DELAY = float(os.getenv("WRITE_BEHIND_RETRY_DELAY", "0.5"))
+WRITE_BEHIND_RETRY_MAX_DELAY = float(os.getenv("WRITE_BEHIND_RETRY_MAX_DELAY", "10"))
+# Commit errors worth retrying; anything else (e.g. NotFound when updating an
+# item deleted in the meantime) will fail again, so that write is dropped
+WRITE_BEHIND_TRANSIENT_ERRORS = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.RetryError,
+    google_exceptions.ServiceUnavailable,
+    ConnectionError,
+    TimeoutError,
+)
+FORM_POST_PATHS = ("/item/create", "/edit/", "/delete/")
+
+form_post_stats = LatencyStats()
+
+
+class WriteBehindQueue:
+    def __init__(self, max_size: int, batch_size: int, window: float):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.batch_size = batch_size
+        self.window = window
+        # uid -> item_id -> (sequence, op, data) of the latest queued write
+        self.pending: dict[str, dict[str, tuple[int, str, dict | None]]] = {}
+        self.sequence = 0
+        self.put_lock = asyncio.Lock()
+        self.commit_stats = LatencyStats()
+        self.writes_committed = 0
+        self.writes_failed = 0
+        self.writes_retried = 0
+        self.started_at: float | None = None
+        self.flusher: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.started_at = time.monotonic()
+        self.flusher = asyncio.create_task(self._run())
+
+    async def enqueue(
+        self, uid: str, op: str, item_id: str, data: dict | None = None
+    ) -> bool:
+        """
+        Queues a "set", "update" or "delete" of an item, waiting for space when
+        the queue is full. Returns False when the queue is not running.
+        """
+        if self.flusher is None or self.flusher.done():
+            return False
+        # Writes wait in line so queue order matches sequence order
+        async with self.put_lock:
+            self.sequence += 1
+            await self.queue.put((self.sequence, uid, op, item_id, data))
+
+            # Fold the write into the overlay shown on the next dashboard render
+            tenant = self.pending.setdefault(uid, {})
+            previous = tenant.get(item_id)
+            if op == "update" and previous and previous[1] != "delete":
+                op, data = previous[1], previous[2] | data
+            tenant[item_id] = (self.sequence, op, data)
+        return True
+
+    def pending_items(self, uid: str) -> dict[str, tuple[int, str, dict | None]]:
+        return dict(self.pending.get(uid, {}))
+
+    async def _run(self) -> None:
+        while True:
+            writes = [await self.queue.get()]
+            if self.window:
+                await asyncio.sleep(self.window)
+            while len(writes) < self.batch_size and not self.queue.empty():
+                writes.append(self.queue.get_nowait())
+            try:
+                await self._commit(writes)
+            finally:
+                for _ in writes:
+                    self.queue.task_done()
+
+    def _apply(self, batch, write) -> None:
+        _, uid, op, item_id, data = write
+        doc_ref = (
+            db.collection("user_data")
+            .document(uid)
+            .collection("items")
+            .document(item_id)
+        )
+        if op == "set":
+            batch.set(doc_ref, data, merge=True)
+        elif op == "update":
+            batch.update(doc_ref, data)
+        else:
+            batch.delete(doc_ref)
+
+    def _commit_batch(self, writes) -> None:
+        batch = db.batch()
+        for write in writes:
+            self._apply(batch, write)
+        batch.commit()
+
+    async def _commit_once(self, writes) -> list:
+        """
+        Commits writes, dropping those that fail permanently. Returns the writes
+        to retry: the first transient failure and every write after it.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            await loop.run_in_executor(None, self._commit_batch, writes)
+            self.commit_stats.record(time.perf_counter() - started)
+            self.writes_committed += len(writes)
+            return []
+        except WRITE_BEHIND_TRANSIENT_ERRORS:
+            self.commit_stats.record(time.perf_counter() - started, failed=True)
+            logger.warning(
+                "Write-behind batch of %s failed transiently",
+                len(writes),
+                exc_info=True,
+            )
+            return writes
+        except Exception:
+            self.commit_stats.record(time.perf_counter() - started, failed=True)
+            logger.exception(
+                "Write-behind batch of %s failed; retrying singly", len(writes)
+            )
+
+        # One bad write (e.g. an update of a deleted item) must not sink the rest
+        for index, write in enumerate(writes):
+            try:
+                await loop.run_in_executor(None, self._commit_batch, [write])
+                self.writes_committed += 1
+            except WRITE_BEHIND_TRANSIENT_ERRORS:
+                return writes[index:]
+            except Exception:
+                self.writes_failed += 1
+                logger.exception(
+                    "Write-behind %s of item %s for user %s failed",
+                    write[2],
+                    write[3],
+                    write[1],
+                )
+        return []
+
+    async def _commit(self, writes) -> None:
+        delay = WRITE_BEHIND_RETRY_DELAY
+        retry = await self._commit_once(writes)
+        try:
+            while retry:
+                self.writes_retried += len(retry)
+                logger.warning(
+                    "Retrying %s write-behind writes in %.1fs", len(retry), delay
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, WRITE_BEHIND_RETRY_MAX_DELAY)
+                retry = await self._commit_once(retry)
+        except asyncio.CancelledError:
+            logger.error(
+                "Shutting down with %s write-behind writes still failing", len(retry)
+            )
+            raise
+
+        for sequence, uid, _, item_id, _ in writes:
+            tenant = self.pending.get(uid, {})
+            if tenant.get(item_id, (None,))[0] == sequence:
+                del tenant[item_id]
+                if not tenant:
+                    del self.pending[uid]
+            invalidate_item_list(uid)
+
+    async def drain(self) -> None:
+        if self.flusher is None:
+            return
+        logger.info("Draining %s queued writes", self.queue.qsize())
+        try:
+            await asyncio.wait_for(self.queue.join(), WRITE_BEHIND_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Write-behind drain timed out with %s writes queued",
+                self.queue.qsize(),
+            )
+        self.flusher.cancel()
+
+    def stats(self) -> dict:
+        commit_stats = self.commit_stats.snapshot()
+        uptime = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            "enabled": FORM_WRITE_BEHIND,
+            "queue_depth": self.queue.qsize(),
+            "pending_tenants": len(self.pending),
+            "writes_committed": self.writes_committed,
+            "writes_failed": self.writes_failed,
+            "writes_retried": self.writes_retried,
+            "commits": commit_stats,
+            "commits_per_second": (
+                round(commit_stats["count"] / uptime, 2) if uptime else 0
+            ),
+        }
+
+
+write_behind = WriteBehindQueue(
+    max_size=WRITE_BEHIND_QUEUE_SIZE,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    window=WRITE_BEHIND_WINDOW,
+)
+
+
+def apply_pending_writes(items, pending: dict):
+    """Overlays queued form writes on items read from Firestore."""
+    pending = dict(pending)
+    for item in items:
+        entry = pending.pop(item["id"], None)
+        if entry is None:
+            yield item
+        elif entry[1] != "delete":
+            yield item | entry[2]
+    # Items created since the read was issued
+    for _, op, data in pending.values():
+        if op == "set":
+            yield data
+
+
+class FormPostTimingMiddleware:
+    """
+    Pure ASGI middleware recording form post latency in form_post_stats, from
+    the request to the final body message.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].removeprefix(scope.get("root_path", ""))
+        if not path.startswith(FORM_POST_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_and_record_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            form_post_stats.record(
+                time.perf_counter() - started, failed=status_code >= 400
+            )
+
+
+app.add_middleware(FormPostTimingMiddleware)
+
+
+# 5. CRUD Routes
 def redirect_to(
     request: Request, route_name: str, status_code: int = 307, **params
 ) -> RedirectResponse:
     url = request.url_for(route_name, **params)
     # Keep redirects relative so the browser stays on the proxy host (Firebase)
-    return RedirectResponse(url=URL(url).path, status_code=status_code)
+    return RedirectResponse(url=URL(str(url)).path, status_code=status_code)
 
 
 @app.post("/item/create", name="create_item")
-async def create_item(request: Request, uid: str = Depends(get_tenant_id)):
+async def create_item(request: Request, uid: str = Depends(get_admitted_tenant_id)):
     """
     Creates a new item with an auto-generated ID
     """
@@ -153,24 +1112,28 @@ async def create_item(request: Request, uid: str = Depends(get_tenant_id)):
     # Create a new document with auto-generated ID
     items_ref = db.collection("user_data").document(uid).collection("items")
     doc_ref = items_ref.document()  # Auto-generates ID
+    data = {
+        "item_name": item_name,
+        "id": doc_ref.id,
+        "owner_id": uid,
+        "created_at": firestore.SERVER_TIMESTAMP,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
 
-    doc_ref.set(
-        {
-            "item_name": item_name,
-            "id": doc_ref.id,
-            "owner_id": uid,
-            "created_at": firestore.SERVER_TIMESTAMP,
-            "updated_at": firestore.SERVER_TIMESTAMP,
-        },
-        merge=True,
-    )
+    if FORM_WRITE_BEHIND and await write_behind.enqueue(uid, "set", doc_ref.id, data):
+        invalidate_item_list(uid)
+        logger.info(f"Queued creation of item {doc_ref.id} for user {uid}")
+        return redirect_to(request, "dashboard", status_code=303)
+
+    doc_ref.set(data, merge=True)
 
+    invalidate_item_list(uid)
     logger.info(f"Created item {doc_ref.id} for user {uid}")
     return redirect_to(request, "dashboard", status_code=303)
 
 
 @app.post("/item")
-async def create_item_api(request: Request, uid: str = Depends(get_tenant_id)):
+async def create_item_api(request: Request, uid: str = Depends(get_admitted_tenant_id)):
     """
     Creates a new item with an auto-generated ID and returns JSON.
     """
@@ -199,13 +1162,14 @@ async def create_item_api(request: Request, uid: str = Depends(get_tenant_id)):
         merge=True,
     )
 
+    invalidate_item_list(uid)
     logger.info("Created item %s for user %s via API", doc_ref.id, uid)
     return {"id": doc_ref.id, "message": "Item created"}
 
 
 @app.put("/item/{item_id}")
 async def update_or_create_item(
-    item_id: str, payload: dict, uid: str = Depends(get_tenant_id)
+    item_id: str, payload: dict, uid: str = Depends(get_admitted_tenant_id)
 ):
     if not isinstance(payload, dict):
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
@@ -230,6 +1194,7 @@ async def update_or_create_item(
 
     # .set with merge=True behaves like a traditional PUT/UPSERT
     doc_ref.set(data, merge=True)
+    invalidate_item_list(uid)
 
     return {"id": item_id, "message": "Item updated/created"}
 
@@ -246,7 +1211,7 @@ async def edit_item_form(request: Request, item_id: str):
         return redirect_to(request, "login")
 
     try:
-        decoded_token = auth.verify_id_token(session)
+        decoded_token = await verify_session_cookie(session)
         uid = decoded_token["uid"]
     except Exception as e:
         logger.warning(f"Session verification failed: {e}")
@@ -256,6 +1221,7 @@ async def edit_item_form(request: Request, item_id: str):
     doc_ref = (
         db.collection("user_data").document(uid).collection("items").document(item_id)
     )
+    admit_tenant(request, uid)
     doc = doc_ref.get()
 
     if not doc.exists:
@@ -275,7 +1241,7 @@ async def edit_item_form(request: Request, item_id: str):
 
 @app.post("/edit/{item_id}", name="update_item")
 async def update_item(
-    request: Request, item_id: str, uid: str = Depends(get_tenant_id)
+    request: Request, item_id: str, uid: str = Depends(get_admitted_tenant_id)
 ):
     """
     Updates an existing item by ID
@@ -294,31 +1260,45 @@ async def update_item(
         db.collection("user_data").document(uid).collection("items").document(item_id)
     )
 
-    # Verify item exists and belongs to user
-    doc = doc_ref.get()
-    if not doc.exists:
+    # Verify item exists and belongs to user, counting queued writes
+    pending = write_behind.pending_items(uid).get(item_id)
+    if pending:
+        exists = pending[1] != "delete"
+    else:
+        exists = doc_ref.get().exists
+    if not exists:
         raise HTTPException(status_code=404, detail="Item not found")
 
+    data = {"item_name": item_name, "updated_at": firestore.SERVER_TIMESTAMP}
+    if FORM_WRITE_BEHIND and await write_behind.enqueue(uid, "update", item_id, data):
+        invalidate_item_list(uid)
+        logger.info(f"Queued update of item {item_id} for user {uid}")
+        return redirect_to(request, "dashboard", status_code=303)
+
     try:
         # Update the document by ID
-        doc_ref.update(
-            {"item_name": item_name, "updated_at": firestore.SERVER_TIMESTAMP}
-        )
+        doc_ref.update(data)
     except Exception:
         logger.exception("Failed to update item %s for user %s", item_id, uid)
         raise HTTPException(status_code=500, detail="Failed to update item")
 
+    invalidate_item_list(uid)
     logger.info(f"Updated item {item_id} for user {uid}")
     return redirect_to(request, "dashboard", status_code=303)
 
 
 @app.post("/delete/{item_id}", name="delete_item")
 async def delete_item(
-    request: Request, item_id: str, uid: str = Depends(get_tenant_id)
+    request: Request, item_id: str, uid: str = Depends(get_admitted_tenant_id)
 ):
     """
     Deletes an item by ID by POSTing from the form
     """
+    if FORM_WRITE_BEHIND and await write_behind.enqueue(uid, "delete", item_id):
+        invalidate_item_list(uid)
+        logger.info(f"Queued deletion of item {item_id} for user {uid}")
+        return redirect_to(request, "dashboard", status_code=303)
+
     try:
         doc_ref = (
             db.collection("user_data")
@@ -331,12 +1311,13 @@ async def delete_item(
         logger.exception("Failed to delete item %s for user %s", item_id, uid)
         raise HTTPException(status_code=500, detail="Failed to delete item")
 
+    invalidate_item_list(uid)
     logger.info(f"Deleted item {item_id} for user {uid}")
     return redirect_to(request, "dashboard", status_code=303)
 
 
 @app.delete("/item/{item_id}")
-async def delete_item_api(item_id: str, uid: str = Depends(get_tenant_id)):
+async def delete_item_api(item_id: str, uid: str = Depends(get_admitted_tenant_id)):
     """
     Deletes an item by ID by DELETEing from the API
     """
@@ -362,12 +1343,13 @@ async def delete_item_api(item_id: str, uid: str = Depends(get_tenant_id)):
         logger.exception("Failed to delete item %s for user %s", item_id, uid)
         raise HTTPException(status_code=500, detail="Failed to delete item")
 
+    invalidate_item_list(uid)
     logger.info("Deleted item %s for user %s via API", item_id, uid)
     return {"id": item_id, "message": "Item deleted"}
 
 
 @app.get("/items")
-async def list_items(uid: str = Depends(get_tenant_id)):
+async def list_items(uid: str = Depends(get_admitted_tenant_id)):
     """Lists items only belonging to the authenticated user/API key owner."""
     logger.info("list_items:start uid=%s", uid)
     items_ref = db.collection("user_data").document(uid).collection("items")
@@ -397,6 +1379,35 @@ async def debug_headers(request: Request):
     }
 
 
+@app.get("/debug-admission")
+async def debug_admission():
+    return admission.stats() | {
+        "limits": {
+            "tenant_rate": ADMISSION_TENANT_RATE,
+            "tenant_burst": ADMISSION_TENANT_BURST,
+            "tenant_concurrency": ADMISSION_TENANT_CONCURRENCY,
+            "max_in_flight": ADMISSION_MAX_IN_FLIGHT,
+        }
+    }
+
+
+@app.get("/debug-auth")
+async def debug_auth():
+    return {
+        "verify_id_token": auth_verify_stats.snapshot(),
+        "verify_session_cookie": session_verify_stats.snapshot(),
+        "session_cache": dict(session_cache_stats) | {"size": len(session_cache)},
+        "cert_refresh": auth_cert_refresh_stats.snapshot(),
+        "cert_max_age": auth_cert_status["expires_in"],
+        "cert_last_refresh": auth_cert_status["last_refresh"],
+    }
+
+
+@app.get("/debug-write-behind")
+async def debug_write_behind():
+    return write_behind.stats() | {"form_posts": form_post_stats.snapshot()}
+
+
 @app.get("/debug-db")
 async def debug_db():
     # Attempt to list all keys in the collection
@@ -413,6 +1424,141 @@ async def debug_db():
     }
 
 
+# 6. Dashboard Rendering
+# With DASHBOARD_STREAMING the page shell is flushed before Firestore is queried
+# and item rows follow as documents arrive. DASHBOARD_FRAGMENT_CACHE keeps the
+# rendered item list per tenant until an item write or the TTL invalidates it.
+# Invalidation only reaches this instance's cache: other Cloud Run instances
+# keep serving their copy, so lists can be stale for up to the TTL there.
+DASHBOARD_STREAMING = env_flag("DASHBOARD_STREAMING", default=True)
+DASHBOARD_STREAM_CHUNK_SIZE = int(os.getenv("DASHBOARD_STREAM_CHUNK_SIZE", "16384"))
+DASHBOARD_FRAGMENT_CACHE = env_flag("DASHBOARD_FRAGMENT_CACHE")
+DASHBOARD_FRAGMENT_CACHE_TTL = float(os.getenv("DASHBOARD_FRAGMENT_CACHE_TTL", "30"))
+DASHBOARD_FRAGMENT_CACHE_SIZE = int(os.getenv("DASHBOARD_FRAGMENT_CACHE_SIZE", "1024"))
+ITEM_LIST_PLACEHOLDER = Markup("<!--item-list-->")
+
+item_list_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+item_list_cache_lock = threading.Lock()
+# Bumped by every write so renders that started before it are not cached.
+# Evicted entries fall back to item_list_generation_floor, which is at least
+# as new as anything evicted.
+item_list_generations: OrderedDict[str, int] = OrderedDict()
+item_list_generation_counter = 0
+item_list_generation_floor = 0
+
+
+def get_cached_item_list(uid: str) -> str | None:
+    if not DASHBOARD_FRAGMENT_CACHE:
+        return None
+    with item_list_cache_lock:
+        entry = item_list_cache.get(uid)
+        if entry is None:
+            return None
+        expires_at, html = entry
+        if expires_at < time.monotonic():
+            del item_list_cache[uid]
+            return None
+        item_list_cache.move_to_end(uid)
+        return html
+
+
+def get_item_list_generation(uid: str) -> int:
+    with item_list_cache_lock:
+        return item_list_generations.get(uid, item_list_generation_floor)
+
+
+def cache_item_list(uid: str, html: str, generation: int) -> None:
+    """Caches a rendered list unless a write happened since its render began."""
+    if not DASHBOARD_FRAGMENT_CACHE:
+        return
+    with item_list_cache_lock:
+        current = item_list_generations.get(uid, item_list_generation_floor)
+        if current != generation:
+            return
+        item_list_cache[uid] = (time.monotonic() + DASHBOARD_FRAGMENT_CACHE_TTL, html)
+        item_list_cache.move_to_end(uid)
+        while len(item_list_cache) > DASHBOARD_FRAGMENT_CACHE_SIZE:
+            item_list_cache.popitem(last=False)
+
+
+def invalidate_item_list(uid: str) -> None:
+    """Drops the cached item list for a tenant after any item write."""
+    global item_list_generation_counter, item_list_generation_floor
+    with item_list_cache_lock:
+        item_list_cache.pop(uid, None)
+        item_list_generation_counter += 1
+        item_list_generations[uid] = item_list_generation_counter
+        item_list_generations.move_to_end(uid)
+        while len(item_list_generations) > DASHBOARD_FRAGMENT_CACHE_SIZE:
+            _, evicted = item_list_generations.popitem(last=False)
+            item_list_generation_floor = max(item_list_generation_floor, evicted)
+
+
+def stream_dashboard(uid: str, page_html: str, pending: dict, generation: int):
+    """
+    Yields the dashboard shell, then the item list rendered row by row as
+    documents are streamed from Firestore, then the rest of the page.
+    Runs in Starlette's threadpool, so the blocking Firestore stream never
+    stalls the event loop.
+    """
+    head, tail = page_html.split(ITEM_LIST_PLACEHOLDER, 1)
+    yield head
+
+    started = time.perf_counter()
+    items_ref = db.collection("user_data").document(uid).collection("items")
+    count = 0
+
+    def items():
+        nonlocal count
+        for doc in items_ref.stream():
+            count += 1
+            yield doc.to_dict() | {"id": doc.id}
+
+    # Lists overlaid with queued writes are not cached
+    rendered = [] if DASHBOARD_FRAGMENT_CACHE and not pending else None
+    buffer, size = [], 0
+    list_open = False
+    item_list = templates.get_template("_item_list.html")
+    try:
+        for chunk in item_list.generate(items=apply_pending_writes(items(), pending)):
+            buffer.append(chunk)
+            size += len(chunk)
+            list_open = list_open or '<ul class="item-list">' in chunk
+            if size >= DASHBOARD_STREAM_CHUNK_SIZE:
+                data = "".join(buffer)
+                if rendered is not None:
+                    rendered.append(data)
+                yield data
+                buffer, size = [], 0
+    except Exception:
+        # The 200 and the page head are already sent, so finish the page
+        # with an error row instead of truncating it
+        logger.exception(
+            "dashboard:stream_failed uid=%s count=%s duration_ms=%.1f",
+            uid,
+            count,
+            (time.perf_counter() - started) * 1000,
+        )
+        buffer.append(
+            templates.get_template("_item_list_error.html").render(list_open=list_open)
+        )
+        yield "".join(buffer) + tail
+        return
+
+    data = "".join(buffer)
+    if rendered is not None:
+        rendered.append(data)
+        cache_item_list(uid, "".join(rendered), generation)
+    yield data + tail
+
+    logger.info(
+        "dashboard:stream_complete uid=%s count=%s duration_ms=%.1f",
+        uid,
+        count,
+        (time.perf_counter() - started) * 1000,
+    )
+
+
 @app.get("/dashboard", name="dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
     # Get session cookie manually for HTML pages
@@ -424,20 +1570,48 @@ async def dashboard(request: Request):
 
     try:
         # Verify the session token
-        decoded_token = auth.verify_id_token(session)
+        decoded_token = await verify_session_cookie(session)
         uid = decoded_token["uid"]
         user_email = decoded_token.get("email", "Unknown User")
     except Exception as e:
         logger.warning(f"Session verification failed: {e}")
         return redirect_to(request, "login")
 
+    admit_tenant(request, uid)
+    return render_dashboard(request, uid, user_email)
+
+
+def render_dashboard(request: Request, uid: str, user_email: str):
+    context = {"request": request, "user": {"email": user_email}}
+    # Writes still in the write-behind queue for this tenant
+    pending = write_behind.pending_items(uid)
+
+    item_list_html = None if pending else get_cached_item_list(uid)
+    generation = get_item_list_generation(uid)
+    if item_list_html is not None:
+        return templates.TemplateResponse(
+            "dashboard.html", context | {"item_list_html": Markup(item_list_html)}
+        )
+
+    if DASHBOARD_STREAMING:
+        page_html = templates.get_template("dashboard.html").render(
+            context | {"item_list_html": ITEM_LIST_PLACEHOLDER}
+        )
+        return StreamingResponse(
+            stream_dashboard(uid, page_html, pending, generation),
+            media_type="text/html",
+        )
+
     # Fetch data using the uid
     items_ref = db.collection("user_data").document(uid).collection("items")
     items = [doc.to_dict() | {"id": doc.id} for doc in items_ref.stream()]
+    items = list(apply_pending_writes(items, pending))
+    item_list_html = templates.get_template("_item_list.html").render(items=items)
+    if not pending:
+        cache_item_list(uid, item_list_html, generation)
 
     return templates.TemplateResponse(
-        "dashboard.html",
-        {"request": request, "items": items, "user": {"email": user_email}},
+        "dashboard.html", context | {"item_list_html": Markup(item_list_html)}
     )
 
 
@@ -468,8 +1642,20 @@ async def debug_login(request: Request, uid: str = "default-user"):
 @app.get("/logout", name="logout")
 async def logout(request: Request):
     """
-    Clears the cookie and redirects home.
+    Revokes the user's sessions, clears the cookie and redirects home.
     """
+    session = request.cookies.get("session")
+    if session:
+        try:
+            uid = (await verify_session_cookie(session))["uid"]
+            # Revoking refresh tokens invalidates every session cookie of the
+            # user, including copies held elsewhere. Other instances reject
+            # them at their next revocation check.
+            await run_auth_backend_call(auth.revoke_refresh_tokens, uid)
+            logger.info(f"Revoked sessions for user: {uid}")
+        except Exception as e:
+            logger.warning(f"Session revocation on logout failed: {e}")
+        evict_session(session)
     response = redirect_to(request, "login")
     response.delete_cookie("session")
     return response
@@ -478,24 +1664,33 @@ async def logout(request: Request):
 @app.post("/auth/session")
 async def create_session(request: Request, session_data: SessionRequest):
     """
-    Receives the Firebase ID token and stores it as a session cookie.
-    The token will be verified on subsequent requests.
+    Exchanges the Firebase ID token for a long-lived Firebase session cookie.
+    The cookie will be verified on subsequent requests.
     """
     try:
-        # Verify the token is valid before storing it
-        decoded_token = auth.verify_id_token(session_data.token)
+        # Verify the token is valid before minting a session for it
+        decoded_token = await verify_id_token(session_data.token)
+    except Exception as e:
+        logger.error(f"Session creation failed: {e}")
+        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+
+    # Only a recent sign-in may mint a long-lived session cookie
+    if time.time() - decoded_token.get("auth_time", 0) > SESSION_MAX_AUTH_AGE:
+        raise HTTPException(status_code=401, detail="Recent sign-in required")
+
+    try:
         logger.info(f"Creating session for user: {decoded_token['uid']}")
+        session_cookie = await create_session_cookie(session_data.token)
 
         response = JSONResponse(content={"status": "success"})
-        # Store the ID token in a cookie
         # For local development with emulator
         response.set_cookie(
             key="session",
-            value=session_data.token,
+            value=session_cookie,
             httponly=True,
             secure=False,  # Set to True in production with HTTPS
             samesite="lax",
-            max_age=3600,  # 1 hour
+            max_age=SESSION_COOKIE_LIFETIME,
         )
         return response
     except Exception as e:
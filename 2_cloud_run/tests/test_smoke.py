@@ -1,4 +1,11 @@
+import re
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pytest
+import requests
 
 
 def test_health(base_url, http_session):
@@ -13,6 +20,33 @@ def test_login_page(base_url, http_session):
     assert "Firebase" in response.text or "login" in response.text.lower()
 
 
+def test_static_assets_are_fingerprinted(base_url, http_session):
+    response = http_session.get(f"{base_url}/login", timeout=10)
+    assert response.status_code == 200
+    match = re.search(
+        r'href="([^"]*/static/css/style\.[0-9a-f]{12}\.css)"', response.text
+    )
+    assert match
+
+    asset_response = http_session.get(
+        urljoin(base_url, match.group(1)),
+        headers={"Accept-Encoding": "gzip"},
+        timeout=10,
+    )
+    assert asset_response.status_code == 200
+    assert "immutable" in asset_response.headers.get("cache-control", "")
+    assert asset_response.headers.get("content-encoding") == "gzip"
+    assert asset_response.headers.get("content-type") == "text/css; charset=utf-8"
+
+    identity_response = http_session.get(
+        urljoin(base_url, match.group(1)),
+        headers={"Accept-Encoding": "gzip;q=0, identity"},
+        timeout=10,
+    )
+    assert identity_response.status_code == 200
+    assert "content-encoding" not in identity_response.headers
+
+
 def test_debug_db(base_url, http_session):
     response = http_session.get(f"{base_url}/debug-db", timeout=10)
     assert response.status_code == 200
@@ -22,6 +56,24 @@ def test_debug_db(base_url, http_session):
     assert "keys_in_db" in payload
 
 
+def test_debug_admission(base_url, http_session):
+    response = http_session.get(f"{base_url}/debug-admission", timeout=10)
+    assert response.status_code == 200
+    payload = response.json()
+    assert "in_flight" in payload
+    assert "rejections" in payload
+    assert "limits" in payload
+
+
+def test_debug_write_behind(base_url, http_session):
+    response = http_session.get(f"{base_url}/debug-write-behind", timeout=10)
+    assert response.status_code == 200
+    payload = response.json()
+    assert "queue_depth" in payload
+    assert "commits_per_second" in payload
+    assert "form_posts" in payload
+
+
 def test_items_smoke_with_api_key(base_url, http_session, api_key):
     item_name = f"smoke-{uuid.uuid4().hex[:8]}"
     item_id = None
@@ -106,3 +158,121 @@ def test_token_based_session_flow(base_url, http_session, auth_id_token):
                 headers={"Authorization": f"Bearer {auth_id_token}"},
                 timeout=10,
             )
+
+
+def test_dashboard_shows_item_after_write(base_url, http_session, auth_id_token):
+    session_response = http_session.post(
+        f"{base_url}/auth/session",
+        json={"token": auth_id_token},
+        timeout=10,
+    )
+    assert session_response.status_code == 200
+
+    # Render once first so a cached item list would have to be invalidated
+    assert http_session.get(f"{base_url}/dashboard", timeout=10).status_code == 200
+
+    item_name = f"smoke-dashboard-{uuid.uuid4().hex[:8]}"
+    item_id = None
+    try:
+        create_response = http_session.post(
+            f"{base_url}/item",
+            headers={"Authorization": f"Bearer {auth_id_token}"},
+            json={"item_name": item_name},
+            timeout=10,
+        )
+        assert create_response.status_code == 200
+        item_id = create_response.json().get("id")
+
+        dashboard_response = http_session.get(f"{base_url}/dashboard", timeout=10)
+        assert dashboard_response.status_code == 200
+        assert f"<span>{item_name}</span>" in dashboard_response.text
+        # A streamed page must still be complete
+        assert "/logout" in dashboard_response.text
+        assert dashboard_response.text.rstrip().endswith("</html>")
+    finally:
+        if item_id:
+            http_session.delete(
+                f"{base_url}/item/{item_id}",
+                headers={"Authorization": f"Bearer {auth_id_token}"},
+                timeout=10,
+            )
+
+
+def test_form_write_behind_read_your_writes(base_url, http_session, auth_id_token):
+    """
+    A form post queued for write-behind must show up on the next dashboard
+    render. Start the server with FORM_WRITE_BEHIND=1 to run this test.
+    """
+    status = http_session.get(f"{base_url}/debug-write-behind", timeout=10).json()
+    if not status["enabled"]:
+        pytest.skip("FORM_WRITE_BEHIND is disabled on this server.")
+
+    session_response = http_session.post(
+        f"{base_url}/auth/session",
+        json={"token": auth_id_token},
+        timeout=10,
+    )
+    assert session_response.status_code == 200
+
+    item_name = f"smoke-form-{uuid.uuid4().hex[:8]}"
+    delete_action = None
+    try:
+        create_response = http_session.post(
+            f"{base_url}/item/create",
+            data={"name": item_name},
+            allow_redirects=False,
+            timeout=10,
+        )
+        assert create_response.status_code == 303
+
+        dashboard_response = http_session.get(f"{base_url}/dashboard", timeout=10)
+        assert dashboard_response.status_code == 200
+        match = re.search(
+            rf'<span>{item_name}</span>.*?action="([^"]*/delete/[^"]+)"',
+            dashboard_response.text,
+            re.DOTALL,
+        )
+        assert match, "Queued item missing from the next dashboard render"
+        delete_action = match.group(1)
+    finally:
+        if delete_action:
+            http_session.post(
+                urljoin(base_url, delete_action), allow_redirects=False, timeout=10
+            )
+
+
+def test_admission_rejects_over_limit_with_retry_after(base_url, http_session, api_key):
+    """
+    Bursts requests for one tenant until it is throttled. For a quick,
+    deterministic run, start the server with a low ADMISSION_TENANT_BURST
+    (e.g. 5) and select this test alone with -k admission.
+    """
+    limits = http_session.get(f"{base_url}/debug-admission", timeout=10).json()[
+        "limits"
+    ]
+    if not limits["tenant_rate"] and not limits["tenant_concurrency"]:
+        pytest.skip("Per-tenant admission limits are disabled on this server.")
+
+    def fetch(_):
+        return requests.get(
+            f"{base_url}/items", headers={"X-API-KEY": api_key}, timeout=10
+        )
+
+    max_attempts = int(limits["tenant_burst"] + limits["tenant_rate"] * 10) + 50
+    rejected = []
+    attempts = 0
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        while not rejected and attempts < max_attempts:
+            responses = list(pool.map(fetch, range(16)))
+            attempts += len(responses)
+            assert {r.status_code for r in responses} <= {200, 429, 503}
+            rejected = [r for r in responses if r.status_code in (429, 503)]
+
+    try:
+        assert rejected, f"No request was throttled after {attempts} attempts"
+        for response in rejected:
+            assert int(response.headers["Retry-After"]) >= 1
+    finally:
+        # Let the tenant's bucket refill so later runs are not throttled
+        if limits["tenant_rate"]:
+            time.sleep(min(limits["tenant_burst"] / limits["tenant_rate"], 10))
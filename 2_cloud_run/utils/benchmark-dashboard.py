@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measures dashboard time to first byte, total time and server memory.
+
+Signs in through the Auth emulator, exchanges the ID token for a session
+cookie and fetches /dashboard repeatedly. With --server-pid (Linux only) the
+server's peak RSS is reset before the runs and read afterwards, so compare
+modes on a freshly started server each time, e.g. once with
+DASHBOARD_STREAMING=0 and once with the default.
+
+Examples:
+    ./utils/generate-scale-data.py --tenants 10 --max-items 20000 --auth-users
+    ./utils/benchmark-dashboard.py --email tenant-00003@example.com \\
+        --server-pid "$(pgrep -f 'uvicorn main:app')"
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import requests
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--email", default="test@example.com")
+    parser.add_argument("--password", default="default-password")
+    parser.add_argument("--auth-emulator-host", default="localhost:9099")
+    parser.add_argument("--firebase-web-api-key", default="fake-api-key")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--server-pid", type=int, help="Report peak RSS of this server process"
+    )
+    return parser.parse_args()
+
+
+def session_cookie(args, http):
+    url = (
+        f"http://{args.auth_emulator_host}/identitytoolkit.googleapis.com/v1/"
+        f"accounts:signInWithPassword?key={args.firebase_web_api_key}"
+    )
+    payload = {"email": args.email, "password": args.password}
+    response = http.post(url, json=payload | {"returnSecureToken": True}, timeout=10)
+    response.raise_for_status()
+    response = http.post(
+        f"{args.base_url.rstrip('/')}/auth/session",
+        json={"token": response.json()["idToken"]},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.cookies["session"]
+
+
+def read_status_kb(pid, field):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    return None
+
+
+def reset_peak_rss(pid):
+    # Writing 5 to clear_refs resets VmHWM to the current RSS
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def fetch(http, url):
+    started = time.perf_counter()
+    with http.get(url, stream=True, allow_redirects=False, timeout=60) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=None)
+        size = len(next(chunks, b""))
+        ttfb = time.perf_counter() - started
+        size += sum(len(chunk) for chunk in chunks)
+    return ttfb, time.perf_counter() - started, size
+
+
+def summary(values):
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return f"p50 {statistics.median(values) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+
+
+def main():
+    args = parse_args()
+    http = requests.Session()
+    http.cookies.set("session", session_cookie(args, http))
+    url = f"{args.base_url.rstrip('/')}/dashboard"
+
+    if args.server_pid:
+        baseline_kb = read_status_kb(args.server_pid, "VmRSS")
+        if not reset_peak_rss(args.server_pid):
+            sys.exit(f"Cannot reset peak RSS of process {args.server_pid}")
+
+    results = [fetch(http, url) for _ in range(args.runs)]
+
+    print(f"{args.runs} runs of {url}, {results[0][2]} bytes")
+    print(f"  TTFB:  {summary([ttfb for ttfb, _, _ in results])}")
+    print(f"  Total: {summary([total for _, total, _ in results])}")
+    if args.server_pid:
+        peak_kb = read_status_kb(args.server_pid, "VmHWM")
+        print(
+            f"  Server RSS: {baseline_kb / 1024:.1f} MiB before, "
+            f"peak {peak_kb / 1024:.1f} MiB (+{(peak_kb - baseline_kb) / 1024:.1f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
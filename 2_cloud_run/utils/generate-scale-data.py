@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Generates realistic multi-tenant data for load and pagination testing.
+
+Creates N tenants whose item counts follow a configurable distribution
+(Zipf by default, so a few tenants are very large and most are small), plus
+API keys per tenant. Output is deterministic for a given --seed and can be
+written to the Firestore emulator or to an in-memory store (optionally dumped
+to JSON). A dump can be loaded back with --input instead of regenerating.
+
+Examples:
+    ./utils/generate-scale-data.py --tenants 100 --max-items 20000
+    ./utils/generate-scale-data.py --target memory --output /tmp/scale.json
+    ./utils/generate-scale-data.py --input /tmp/scale.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_SIZE = 500
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument(
+        "--distribution", choices=["zipf", "uniform", "fixed"], default="zipf"
+    )
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=5000,
+        help="Items for the largest tenant (zipf/fixed) or upper bound (uniform)",
+    )
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--keys-per-tenant", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--target", choices=["emulator", "memory"], default="emulator")
+    parser.add_argument(
+        "--output", help="With --target memory, write the store to this JSON file"
+    )
+    parser.add_argument(
+        "--input", help="Load documents from a --target memory dump instead"
+    )
+    parser.add_argument(
+        "--auth-users",
+        action="store_true",
+        help="Also create an Auth emulator user per tenant (password: default-password)",
+    )
+    return parser.parse_args()
+
+
+def item_counts(args, rng):
+    if args.distribution == "fixed":
+        counts = [args.max_items] * args.tenants
+    elif args.distribution == "uniform":
+        counts = [rng.randint(0, args.max_items) for _ in range(args.tenants)]
+    else:
+        counts = [
+            int(args.max_items / rank**args.zipf_s)
+            for rank in range(1, args.tenants + 1)
+        ]
+        # Spread the large tenants across the id space
+        rng.shuffle(counts)
+    return counts
+
+
+def generate(args):
+    """
+    Yields (path, data) pairs. Paths are tuples of alternating collection and
+    document ids, e.g. ("user_data", uid, "items", item_id).
+    """
+    rng = random.Random(args.seed)
+    base_time = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+    for index, count in enumerate(item_counts(args, rng)):
+        uid = f"tenant-{index:05d}"
+        for key_index in range(args.keys_per_tenant):
+            api_key = f"{uid}-key-{rng.getrandbits(64):016x}"
+            yield ("api_keys", api_key), {
+                "uid": uid,
+                "name": f"Scale Key {key_index}",
+                "created_at": base_time,
+            }
+        for item_index in range(count):
+            item_id = f"{rng.getrandbits(80):020x}"
+            timestamp = base_time + datetime.timedelta(seconds=item_index)
+            yield ("user_data", uid, "items", item_id), {
+                "item_name": f"Item {item_index} of {uid}",
+                "id": item_id,
+                "owner_id": uid,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+
+
+# Fields stored as Firestore timestamps, written to dumps as ISO 8601 strings
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def load_dump(filename):
+    """Yields (path, data) pairs from a MemoryStore dump, like generate()."""
+    with open(filename) as f:
+        root = json.load(f)
+
+    def walk(collections, prefix):
+        for collection, docs in collections.items():
+            for doc_id, doc in docs.items():
+                path = prefix + (collection, doc_id)
+                if doc["data"]:
+                    data = dict(doc["data"])
+                    for field in TIMESTAMP_FIELDS:
+                        if isinstance(data.get(field), str):
+                            data[field] = datetime.datetime.fromisoformat(data[field])
+                    yield path, data
+                yield from walk(doc["collections"], path)
+
+    yield from walk(root, ())
+
+
+def batched(iterable, size):
+    batch = []
+    for entry in iterable:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class MemoryStore:
+    """Nested dict store: {collection: {doc_id: {"data": ..., "collections": ...}}}"""
+
+    def __init__(self):
+        self.root = {}
+        self.lock = threading.Lock()
+
+    def write_batch(self, batch):
+        with self.lock:
+            for path, data in batch:
+                collections = self.root
+                for i in range(0, len(path) - 2, 2):
+                    doc = collections.setdefault(path[i], {}).setdefault(
+                        path[i + 1], {"data": {}, "collections": {}}
+                    )
+                    collections = doc["collections"]
+                collections.setdefault(path[-2], {})[path[-1]] = {
+                    "data": data,
+                    "collections": {},
+                }
+
+    def dump(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.root, f, default=lambda value: value.isoformat())
+
+
+class FirestoreStore:
+    def __init__(self):
+        os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "default-project")
+        os.environ.setdefault("FIRESTORE_EMULATOR_HOST", "localhost:8081")
+        os.environ.setdefault("FIREBASE_AUTH_EMULATOR_HOST", "localhost:9099")
+
+        import firebase_admin
+        from firebase_admin import firestore
+
+        firebase_admin.initialize_app()
+        self.db = firestore.client()
+
+    def write_batch(self, batch):
+        write_batch = self.db.batch()
+        for path, data in batch:
+            write_batch.set(self.db.document(*path), data)
+        write_batch.commit()
+
+    def create_auth_users(self, uids):
+        from firebase_admin import auth
+
+        for uid in uids:
+            try:
+                auth.create_user(
+                    uid=uid, email=f"{uid}@example.com", password="default-password"
+                )
+            except auth.UidAlreadyExistsError:
+                pass
+
+
+def main():
+    args = parse_args()
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        sys.exit(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
+
+    if args.target == "emulator":
+        store = FirestoreStore()
+    else:
+        store = MemoryStore()
+
+    if args.input:
+        documents = load_dump(args.input)
+        print(f"Loading {args.input} into {args.target}...")
+    else:
+        documents = generate(args)
+        print(
+            f"Generating {args.tenants} tenants ({args.distribution}, "
+            f"max {args.max_items} items, seed {args.seed}) into {args.target}..."
+        )
+
+    started = time.perf_counter()
+    written = 0
+    commits = 0
+    uids = set()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        pending = []
+        for batch in batched(documents, args.batch_size):
+            pending.append(pool.submit(store.write_batch, batch))
+            written += len(batch)
+            uids.update(data["uid"] for path, data in batch if path[0] == "api_keys")
+            # Keep a bounded number of batches in memory
+            if len(pending) >= args.workers * 2:
+                pending.pop(0).result()
+                commits += 1
+        for future in pending:
+            future.result()
+            commits += 1
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Wrote {written} documents in {commits} batches in {elapsed:.2f}s "
+        f"({written / elapsed:.0f} docs/s, {commits / elapsed:.1f} commits/s)"
+    )
+
+    if args.auth_users and args.target == "emulator":
+        store.create_auth_users(sorted(uids))
+        print(f"Created {len(uids)} Auth users")
+
+    if args.output and args.target == "memory":
+        store.dump(args.output)
+        print(f"Saved in-memory store to {args.output}")
+
+    print("Done!")
+
+
+if __name__ == "__main__":
+    main()